@@ -15,6 +15,10 @@ from nabs.utils import ErrorSignal, InvertedSignal
 
 logger = logging.getLogger(__name__)
 
+# Golden-section search shrinks the region by this ratio at every step
+_INV_GOLDEN_RATIO = 1 / golden_ratio
+_LOG_INV_GOLDEN_RATIO = math.log(_INV_GOLDEN_RATIO)
+
 
 def minimize(*args, **kwargs):
     """
@@ -208,15 +212,14 @@ def golden_section_search(signal, motor, tolerance, limits, average=None):
     if region_size <= tolerance:
         return (a, b)
     # Determine the number of steps to converge
-    n = math.ceil(math.log(tolerance/region_size)
-                  / math.log(1/golden_ratio))
+    n = math.ceil(math.log(tolerance/region_size) / _LOG_INV_GOLDEN_RATIO)
     logger.debug("Beginning golden-section search, "
                  "narrowing extrema location to %r "
                  "will require %r steps",
                  tolerance, n)
     # Place holders for probe values
-    c = b - region_size/golden_ratio
-    d = a + region_size/golden_ratio
+    c = b - region_size*_INV_GOLDEN_RATIO
+    d = a + region_size*_INV_GOLDEN_RATIO
     # Examine our new probe locations
     low_probe = yield from measure_probe(c)
     high_probe = yield from measure_probe(d)
@@ -229,9 +232,9 @@ def golden_section_search(signal, motor, tolerance, limits, average=None):
             b = d
             d = c
             high_probe = low_probe
-            region_size /= golden_ratio
+            region_size *= _INV_GOLDEN_RATIO
             # Calculate next probe
-            c = b - region_size/golden_ratio
+            c = b - region_size*_INV_GOLDEN_RATIO
             # Measure next probe
             low_probe = yield from measure_probe(c)
         else:
@@ -239,9 +242,9 @@ def golden_section_search(signal, motor, tolerance, limits, average=None):
             a = c
             c = d
             low_probe = high_probe
-            region_size /= golden_ratio
+            region_size *= _INV_GOLDEN_RATIO
             # Calculate next probe
-            d = a + region_size/golden_ratio
+            d = a + region_size*_INV_GOLDEN_RATIO
             # Measure next probe
             high_probe = yield from measure_probe(d)
     # Return the final banding region
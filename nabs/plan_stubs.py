@@ -7,14 +7,24 @@ The plans in this module are not meant to be run individually, instead these
 are intended as building blocks for other complete plans.
 """
 import logging
+import os
+import shutil
+import tempfile
+from functools import partial
 
+import numpy as np
 import yaml
-from bluesky.plan_stubs import subscribe
-from bluesky.plans import count
-from bluesky.preprocessors import stub_wrapper
+from bluesky.plan_stubs import repeat, subscribe, trigger_and_read
 
 from nabs.streams import AverageStream
 
+# Sample files can hold thousands of targets, use libyaml when available
+try:
+    from yaml import CSafeDumper as SafeDumper
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeDumper, SafeLoader
+
 logger = logging.getLogger(__name__)
 
 
@@ -31,8 +41,8 @@ def measure_average(detectors, num, delay=None, stream=None):
         Number of shots to average together
 
     delay : iterable or scalar, optional
-        Time delay between successive readings. See `bluesky.plans.count`
-        for more details
+        Time delay between successive readings. See
+        `bluesky.plan_stubs.repeat` for more details
 
     stream : :py:class:`nabs.streams.AverageStream`, optional
         If a plan will call `measure_average` multiple times, a single
@@ -64,8 +74,9 @@ def measure_average(detectors, num, delay=None, stream=None):
     # Ensure we sync our stream with request if using a prior one
     else:
         stream.num = num
-    # Measure our detectors
-    yield from stub_wrapper(count(detectors, num=num, delay=delay))
+    # Measure our detectors, one bundle per shot
+    yield from repeat(partial(trigger_and_read, list(detectors)),
+                      num=num, delay=delay)
     # Return the measured average as a dictionary for use in adaptive plans
     return stream.last_event
 
@@ -88,45 +99,43 @@ def update_sample(sample_name, path, n_shots):
         Indicates how many targets have been shot.
 
     """
-    info = get_sample_targets(sample_name, path)
-    data = {}
-    # list of dictionaries
-    xx = info[0]
-    yy = info[1]
-    # find the index of the targets that is next to be shot
-    x_index = next((index for (index, d) in enumerate(xx)
-                    if d["status"] is False), None)
-    if x_index is None:
+    xx, yy = get_sample_targets(sample_name, path)
+    status = _get_targets_status(sample_name, xx, yy)
+    # indices of the targets that are still available, in shooting order
+    available = np.flatnonzero(~status)
+    if not available.size:
         raise IndexError('Could not get a target index that has not been shot,'
                          ' probably all targets were shot from this sample?')
-
-    temp_x, temp_y = [], []
-    for i in range(n_shots):
-        # update the status for the next target where the status is False
-        x_target = next((item for item in xx if item['status'] is False), None)
-        y_target = next((item for item in yy if item["status"] is False), None)
-        # should not be getting here but just in case:
-        if x_target is None:
-            raise IndexError('Could not update the status of targets. '
-                             'Probably all targets from this sample were shot '
-                             'already....')
-        x_target['status'] = True
-        y_target['status'] = True
-        temp_x.append(x_target)
-        temp_y.append(y_target)
-
-    # update the list original list of target
-    xx[x_index:(x_index + len(temp_x))] = temp_x
-    yy[x_index:(x_index + len(temp_y))] = temp_y
-    data['xx'] = xx
-    data['yy'] = yy
+    if available.size < n_shots:
+        raise IndexError('Could not update the status of targets. '
+                         'Probably all targets from this sample were shot '
+                         'already....')
+    # only touch the status, the rest of the targets is written back as is
+    for index in available[:max(n_shots, 0)]:
+        xx[index]['status'] = True
+        yy[index]['status'] = True
+    data = {'xx': xx, 'yy': yy}
 
     with open(path) as sample_file:
-        yaml_dict = yaml.safe_load(sample_file) or {}
+        yaml_dict = yaml.load(sample_file, Loader=SafeLoader) or {}
         yaml_dict[sample_name].update(data)
-    with open(path, 'w') as sample_file:
-        yaml.safe_dump(yaml_dict, sample_file,
-                       sort_keys=False, default_flow_style=False)
+    contents = yaml.dump(yaml_dict, Dumper=SafeDumper, sort_keys=False,
+                         default_flow_style=False)
+    # Write a sibling file and swap it in so that the sample file is never
+    # left half-written if we are interrupted. Resolve symlinks so that we
+    # replace the file they point to rather than the link itself.
+    real_path = os.path.realpath(path)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(real_path),
+                                    suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w') as sample_file:
+            sample_file.write(contents)
+        shutil.copymode(real_path, tmp_path)
+        os.replace(tmp_path, real_path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
 
 
 def get_sample_targets(sample_name, path):
@@ -134,7 +143,8 @@ def get_sample_targets(sample_name, path):
     Get the ``xx`` and ``yy`` target information from a saved sample.
 
     Given a sample name, get the x, y grid points that are mapped for that
-    sample.
+    sample. See `get_sample_targets_arrays` for the positions and status as
+    `numpy` arrays.
 
     Parameters
     ----------
@@ -152,7 +162,7 @@ def get_sample_targets(sample_name, path):
     data = None
     with open(path) as sample_file:
         try:
-            data = yaml.safe_load(sample_file)
+            data = yaml.load(sample_file, Loader=SafeLoader)
         except yaml.YAMLError as err:
             logger.error('Error when loading the samples yaml file: %s',
                          err)
@@ -169,3 +179,62 @@ def get_sample_targets(sample_name, path):
     except Exception:
         err_msg = (f'This sample {sample_name} might not exist in the file.')
         raise Exception(err_msg)
+
+
+def get_sample_targets_arrays(sample_name, path):
+    """
+    Get the ``xx`` and ``yy`` target information as arrays.
+
+    Given a sample name, get the x, y grid points that are mapped for that
+    sample, along with the status of each target.
+
+    Parameters
+    ----------
+    sample_name : str
+        The name of the sample to get the mapped points from. To see the
+        available mapped samples call the ``mapped_samples`` method.
+    path : str, optional
+        Path to the samples yaml file.
+
+    Returns
+    -------
+    ``xx``, ``yy``, ``status`` : tuple of `numpy.ndarray`
+        The x and y positions of the targets, and a boolean array that is
+        `True` for the targets that have been shot.
+
+    Raises
+    ------
+    Exception
+        If the ``xx`` and ``yy`` targets do not have the same length or do
+        not agree on which targets have been shot.
+    """
+    xx, yy = get_sample_targets(sample_name, path)
+    status = _get_targets_status(sample_name, xx, yy)
+    try:
+        xx_pos = np.fromiter((target['pos'] for target in xx),
+                             dtype=np.float64, count=len(xx))
+        yy_pos = np.fromiter((target['pos'] for target in yy),
+                             dtype=np.float64, count=len(yy))
+    except Exception:
+        err_msg = (f'This sample {sample_name} might not exist in the file.')
+        raise Exception(err_msg)
+    return xx_pos, yy_pos, status
+
+
+def _get_targets_status(sample_name, xx, yy):
+    """Get the shot status of the targets, checking ``xx`` and ``yy`` agree."""
+    if len(xx) != len(yy):
+        raise Exception(f'The sample {sample_name} has {len(xx)} xx targets '
+                        f'but {len(yy)} yy targets.')
+    try:
+        xx_status = np.fromiter((target['status'] for target in xx),
+                                dtype=bool, count=len(xx))
+        yy_status = np.fromiter((target['status'] for target in yy),
+                                dtype=bool, count=len(yy))
+    except Exception:
+        err_msg = (f'This sample {sample_name} might not exist in the file.')
+        raise Exception(err_msg)
+    if not np.array_equal(xx_status, yy_status):
+        raise Exception(f'The xx and yy targets of sample {sample_name} do '
+                        'not have the same status.')
+    return xx_status
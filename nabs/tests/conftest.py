@@ -1,4 +1,5 @@
 import os
+import shutil
 import sys
 
 import pytest
@@ -12,8 +13,8 @@ from pcdsdaq.daq import Daq
 from pcdsdaq.sim import set_sim_mode
 
 
-@pytest.fixture(scope='function')
-def RE():
+@pytest.fixture(scope='session')
+def _RE():
     RE = RunEngine({})
     loop = get_bluesky_event_loop()
     loop.set_debug(True)
@@ -24,6 +25,22 @@ def RE():
         RE.halt()
 
 
+@pytest.fixture(scope='function')
+def RE(_RE):
+    """The shared RunEngine, returned to a clean state after each test."""
+    md = dict(_RE.md)
+
+    yield _RE
+
+    if _RE.state != 'idle':
+        _RE.halt()
+    _RE.dispatcher.unsubscribe_all()
+    _RE.preprocessors.clear()
+    _RE.clear_suspenders()
+    _RE.md.clear()
+    _RE.md.update(md)
+
+
 class NoOpPseudo(PseudoPositioner):
     softpos = Cpt(SoftPositioner)
     noop = Cpt(PseudoSingle)
@@ -75,10 +92,10 @@ def ipython():
     return MockIPython()
 
 
-@pytest.fixture(scope='function')
-def sample_file(tmp_path):
-    path = tmp_path / "sub"
-    path.mkdir()
+@pytest.fixture(scope='session')
+def sample_file_src(tmp_path_factory):
+    """Sample file shared by the whole session, tests must not modify it."""
+    path = tmp_path_factory.mktemp("sub")
     sample_file = path / "samples.yml"
     sample_file.write_text("""
 test_sample:
@@ -144,6 +161,16 @@ test_sample:
     return sample_file
 
 
+@pytest.fixture(scope='function')
+def sample_file(sample_file_src, tmp_path):
+    """Copy of the sample file for tests that update the targets."""
+    path = tmp_path / "sub"
+    path.mkdir()
+    sample_file = path / "samples.yml"
+    shutil.copyfile(sample_file_src, sample_file)
+    return sample_file
+
+
 @pytest.fixture(scope='function', autouse=(sys.platform == 'win32'))
 def patch_uname_for_windows(monkeypatch):
     monkeypatch.setattr(os, 'uname', lambda: 'hostname', raising=False)
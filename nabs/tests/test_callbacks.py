@@ -60,7 +60,7 @@ def test_elog_callback(RE, hw, elog, ipython):
 )
 def test_bec_options(RE, hw, disable_plots, disable_table):
     bec = BECOptionsPerRun()
-    RE.subscribe(bec)
+    bec_uid = RE.subscribe(bec)
 
     # starts plotting by default
     RE(bp.scan([hw.det], hw.motor, -5, 5, 5))
@@ -77,3 +77,6 @@ def test_bec_options(RE, hw, disable_plots, disable_table):
     RE(bp.scan([hw.det], hw.motor, -5, 5, 5))
     assert bec._table
     assert bec._live_plots
+
+    # cleanup
+    RE.unsubscribe(bec_uid)
@@ -11,14 +11,24 @@ from nabs.optimize import (golden_section_search, maximize, minimize, optimize,
 logger = logging.getLogger(__name__)
 
 
-@pytest.fixture(scope='function')
-def inverted_gauss():
+@pytest.fixture(scope='module')
+def _inverted_gauss_devices():
     motor = SynAxis(name='motor')
     # Make our inverted detector
     sig = SynGauss('det', motor, 'motor', center=0, Imax=-1, sigma=1)
     return (sig, motor)
 
 
+@pytest.fixture(scope='function')
+def inverted_gauss(_inverted_gauss_devices):
+    """The shared inverted gaussian, motor back at 0 and without limits."""
+    (sig, motor) = _inverted_gauss_devices
+    # Tests may set limits on the shared motor, SynAxis has none by default
+    vars(motor).pop('limits', None)
+    motor.set(0)
+    return (sig, motor)
+
+
 @pytest.fixture(scope='function')
 def linear():
     motor = SynAxis(name='motor')
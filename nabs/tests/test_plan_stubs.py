@@ -5,10 +5,33 @@ import pytest
 from bluesky.callbacks import CallbackCounter
 from bluesky.plan_stubs import close_run, open_run
 
-from nabs.plan_stubs import get_sample_targets, measure_average, update_sample
+from nabs.plan_stubs import (get_sample_targets, get_sample_targets_arrays,
+                             measure_average, update_sample)
 
 logger = logging.getLogger(__name__)
 
+# Target positions stored in the ``sample_file`` fixture
+_XX_EXPECTED = np.array([
+    -20.59374999999996,
+    -20.342057291666624,
+    -20.090364583333283,
+    -19.838671874999946,
+    -19.834546874999948,
+    -20.08622265624995,
+    -20.33789843749996,
+    -20.589574218749963,
+], dtype=np.float64)
+_YY_EXPECTED = np.array([
+    26.41445312499999,
+    26.412369791666656,
+    26.41028645833332,
+    26.408203124999986,
+    26.664453124999994,
+    26.66232812499999,
+    26.660203124999992,
+    26.65807812499999,
+], dtype=np.float64)
+
 
 def test_measure_average(RE, hw):
     logger.debug("test_measure_average")
@@ -20,7 +43,7 @@ def test_measure_average(RE, hw):
         logger.debug('Test received %s from measure_average', str(ret))
         assert ret['motor'] == 0.0
         assert ret['motor_setpoint'] == 0.0
-        assert np.isclose(ret['noisy_det'], 1.0, atol=0.1)
+        assert abs(ret['noisy_det'] - 1.0) < 0.1
         yield from close_run()
 
     # Execute plan
@@ -30,66 +53,103 @@ def test_measure_average(RE, hw):
     assert cnt.value == 250
 
 
+def assert_targets(targets, expected_pos, expected_status):
+    """Compare a list of target dictionaries to the expected values."""
+    np.testing.assert_allclose([target['pos'] for target in targets],
+                               expected_pos, rtol=1e-12)
+    assert [target['status'] for target in targets] == expected_status
+
+
 def test_update_sample(sample_file):
     # current sample name: test_sample
     sample = "test_sample"
-    xx, yy = get_sample_targets(sample_name=sample, path=sample_file)
-    # expected values:
-    xx_expected = [
-        {"pos": -20.59374999999996, "status": True},
-        {"pos": -20.342057291666624, "status": True},
-        {"pos": -20.090364583333283, "status": True},
-        {"pos": -19.838671874999946, "status": True},
-        {"pos": -19.834546874999948, "status": False},
-        {"pos": -20.08622265624995, "status": False},
-        {"pos": -20.33789843749996, "status": False},
-        {"pos": -20.589574218749963, "status": False},
-    ]
-    yy_expected = [
-        {"pos": 26.41445312499999, "status": True},
-        {"pos": 26.412369791666656, "status": True},
-        {"pos": 26.41028645833332, "status": True},
-        {"pos": 26.408203124999986, "status": True},
-        {"pos": 26.664453124999994, "status": False},
-        {"pos": 26.66232812499999, "status": False},
-        {"pos": 26.660203124999992, "status": False},
-        {"pos": 26.65807812499999, "status": False},
-    ]
     update_sample(sample_name=sample, path=sample_file, n_shots=4)
     xx, yy = get_sample_targets(sample_name=sample, path=sample_file)
-    assert xx == xx_expected
-    assert yy == yy_expected
-
-
-def test_get_sample_targets(sample_file):
-    # expected values:
-    xx_expected = [
-        {"pos": -20.59374999999996, "status": False},
-        {"pos": -20.342057291666624, "status": False},
-        {"pos": -20.090364583333283, "status": False},
-        {"pos": -19.838671874999946, "status": False},
-        {"pos": -19.834546874999948, "status": False},
-        {"pos": -20.08622265624995, "status": False},
-        {"pos": -20.33789843749996, "status": False},
-        {"pos": -20.589574218749963, "status": False},
-    ]
-    yy_expected = [
-        {"pos": 26.41445312499999, "status": False},
-        {"pos": 26.412369791666656, "status": False},
-        {"pos": 26.41028645833332, "status": False},
-        {"pos": 26.408203124999986, "status": False},
-        {"pos": 26.664453124999994, "status": False},
-        {"pos": 26.66232812499999, "status": False},
-        {"pos": 26.660203124999992, "status": False},
-        {"pos": 26.65807812499999, "status": False},
-    ]
-    xx, yy = get_sample_targets(sample_name="test_sample", path=sample_file)
-    assert xx == xx_expected
-    assert yy == yy_expected
+    status_expected = [True] * 4 + [False] * 4
+    assert_targets(xx, _XX_EXPECTED, status_expected)
+    assert_targets(yy, _YY_EXPECTED, status_expected)
+
+
+def test_get_sample_targets(sample_file_src):
+    xx, yy = get_sample_targets(sample_name="test_sample",
+                                path=sample_file_src)
+    status_expected = [False] * 8
+    assert_targets(xx, _XX_EXPECTED, status_expected)
+    assert_targets(yy, _YY_EXPECTED, status_expected)
 
     with pytest.raises(Exception):
         get_sample_targets(
-            sample_name='bad_test_sample_name', path=sample_file)
+            sample_name='bad_test_sample_name', path=sample_file_src)
     with pytest.raises(Exception):
         get_sample_targets(
             sample_name='test_sample', path='bad_file_path')
+
+
+def test_get_sample_targets_arrays(sample_file):
+    update_sample(sample_name="test_sample", path=sample_file, n_shots=3)
+    xx, yy, status = get_sample_targets_arrays(sample_name="test_sample",
+                                               path=sample_file)
+    np.testing.assert_allclose(xx, _XX_EXPECTED, rtol=1e-12)
+    np.testing.assert_allclose(yy, _YY_EXPECTED, rtol=1e-12)
+    assert status.tolist() == [True] * 3 + [False] * 5
+
+
+def test_update_sample_keeps_targets(tmp_path):
+    sample_file = tmp_path / "samples.yml"
+    sample_file.write_text("""
+test_sample:
+  xx:
+  - pos: 1
+    status: false
+    note: edge
+  - pos: 2
+    status: false
+  yy:
+  - pos: 3
+    status: false
+  - pos: 4
+    status: false
+    """)
+    update_sample(sample_name="test_sample", path=sample_file, n_shots=1)
+    xx, yy = get_sample_targets(sample_name="test_sample", path=sample_file)
+    # only the status changes, positions and extra keys are left as they were
+    assert xx == [{'pos': 1, 'status': True, 'note': 'edge'},
+                  {'pos': 2, 'status': False}]
+    assert yy == [{'pos': 3, 'status': True}, {'pos': 4, 'status': False}]
+
+
+@pytest.mark.parametrize(
+    "targets",
+    [
+        # more yy targets than xx targets
+        """
+  xx:
+  - pos: 1
+    status: false
+  yy:
+  - pos: 3
+    status: false
+  - pos: 4
+    status: false
+""",
+        # yy status does not match the xx status
+        """
+  xx:
+  - pos: 1
+    status: false
+  yy:
+  - pos: 3
+    status: true
+""",
+    ],
+)
+def test_mismatched_sample_targets(tmp_path, targets):
+    sample_file = tmp_path / "samples.yml"
+    contents = "test_sample:" + targets
+    sample_file.write_text(contents)
+    with pytest.raises(Exception):
+        get_sample_targets_arrays(sample_name="test_sample", path=sample_file)
+    with pytest.raises(Exception):
+        update_sample(sample_name="test_sample", path=sample_file, n_shots=1)
+    # nothing is written back to the file
+    assert sample_file.read_text() == contents
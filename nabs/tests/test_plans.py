@@ -1,24 +1,83 @@
 import logging
-from collections import defaultdict
+from collections import Counter, defaultdict
+from itertools import chain, islice
+from operator import attrgetter
 
 import numpy as np
 import pytest
-from bluesky.simulators import summarize_plan
+from bluesky.preprocessors import msg_mutator, pchain
 from ophyd.device import Component as Cpt
 from ophyd.signal import Signal
 from pcdsdevices.pseudopos import DelayBase
 from pcdsdevices.sim import FastMotor
 
 import nabs.plans as nbp
+from nabs.plan_stubs import get_sample_targets_arrays
 from nabs.utils import orange
 
 run_time_motor_tests = True
 
 
 PLAN_TIMEOUT = 60
+# Messages of a duration scan to inspect, enough for more than 20 steps
+DURATION_SCAN_PREFIX = 500
 logger = logging.getLogger(__name__)
 
 
+# Positions set by the fixed target scans on the ``sample_file`` targets
+FT_EXPECTED_MOVES = np.array([
+    1,                    # scan_motor[0]
+    -20.59374999999996,   # x[0]
+    26.41445312499999,    # y[0]
+    -20.342057291666624,  # x[1]
+    26.412369791666656,   # y[1]
+    -20.090364583333283,  # x[2]
+    26.41028645833332,    # y[2]
+    2,                    # scan_motor[1]
+    -19.838671874999946,  # x[3]
+    26.408203124999986,   # y[3]
+    -19.834546874999948,  # x[4]
+    26.664453124999994,   # y[4]
+    -20.08622265624995,   # x[5]
+    26.66232812499999,    # y[5]
+], dtype=np.float64)
+FT_MULTI_EXPECTED_MOVES = np.array([
+    1,                    # scan_motor[0]
+    -20.59374999999996,   # x[0]
+    26.41445312499999,    # y[0]
+    -20.59374999999996,   # x[0]
+    26.41445312499999,    # y[0]
+    -20.59374999999996,   # x[0]
+    26.41445312499999,    # y[0]
+    2,                    # scan_motor[1]
+    -20.342057291666624,  # x[1]
+    26.412369791666656,   # y[1]
+    -20.342057291666624,  # x[1]
+    26.412369791666656,   # y[1]
+    -20.342057291666624,  # x[1]
+    26.412369791666656,   # y[1]
+], dtype=np.float64)
+# Shared by every parametrization, make sure no test can modify them
+FT_EXPECTED_MOVES.setflags(write=False)
+FT_MULTI_EXPECTED_MOVES.setflags(write=False)
+
+
+def collect_plan(plan):
+    """
+    Expand a plan in a single pass.
+
+    Returns the list of messages, the positions that are set and a
+    dictionary of the messages grouped by command.
+    """
+    msgs = []
+    by_command = defaultdict(list)
+    for msg in plan:
+        msgs.append(msg)
+        by_command[msg.command].append(msg)
+    moves = [msg.args[0] for msg in by_command['set']]
+    return msgs, moves, by_command
+
+
 @pytest.mark.timeout(PLAN_TIMEOUT)
 def test_duration_scan(RE, hw):
     """Run the duration scan and check the messages it creates."""
@@ -28,20 +87,27 @@ def test_duration_scan(RE, hw):
     # WARNING: this test can fail if run on a low-powered CPU
     # For example, if only 2 points are generated in the timespan
     # TODO: revise duration_scan to make it more testable
-    scan1 = list(nbp.duration_scan([hw.det], hw.motor, [0, 1], duration=0.1))
-    scan2 = list(nbp.duration_scan([hw.det1, hw.det2], hw.motor1, [-1, 1],
-                                   hw.motor2, [-2, 2], duration=0.1))
+    # Only the start of each scan is inspected, so stop expanding the plans
+    # after DURATION_SCAN_PREFIX messages rather than for the full duration
+    _, scan1_moves, _ = collect_plan(islice(
+        nbp.duration_scan([hw.det], hw.motor, [0, 1], duration=0.1),
+        DURATION_SCAN_PREFIX
+    ))
+    _, scan2_moves, _ = collect_plan(islice(
+        nbp.duration_scan([hw.det1, hw.det2], hw.motor1, [-1, 1],
+                          hw.motor2, [-2, 2], duration=0.1),
+        DURATION_SCAN_PREFIX
+    ))
 
     # I won't check behavior, but they should not error out
-    RE(scan1)
-    RE(scan2)
+    RE(nbp.duration_scan([hw.det], hw.motor, [0, 1], duration=0.1))
+    RE(nbp.duration_scan([hw.det1, hw.det2], hw.motor1, [-1, 1],
+                         hw.motor2, [-2, 2], duration=0.1))
 
     # Scan should cycle through positions
-    scan1_moves = list(msg.args[0] for msg in scan1 if msg.command == 'set')
     assert scan1_moves[:4] == [0, 1, 0, 1]
     assert len(scan1_moves) > 20
 
-    scan2_moves = list(msg.args[0] for msg in scan2 if msg.command == 'set')
     assert scan2_moves[:8] == [-1, -2, 1, 2, -1, -2, 1, 2]
     assert len(scan2_moves) > 20
 
@@ -55,13 +121,21 @@ class SimDelayStage(DelayBase):
     motor = Cpt(SimDelayMotor)
 
 
-@pytest.fixture(scope='function')
-def time_motor():
+@pytest.fixture(scope='module')
+def _time_motor_device():
     if not run_time_motor_tests:
         pytest.skip(reason='pcdsdevices tests do not run prior to python 3.9')
     return SimDelayStage('SIM', name='sim', egu='s', n_bounces=1)
 
 
+@pytest.fixture(scope='function')
+def time_motor(_time_motor_device):
+    """The shared delay stage, put back at rest for each test."""
+    _time_motor_device.motor.velocity.put(0)
+    _time_motor_device.motor.set(0)
+    return _time_motor_device
+
+
 @pytest.mark.timeout(PLAN_TIMEOUT)
 def test_delay_scan(RE, hw, time_motor):
     """Check the delay scan, verify that velo is set appropriately."""
@@ -69,8 +143,9 @@ def test_delay_scan(RE, hw, time_motor):
 
     # Speed of light is more or less 3e8
     goal = 1/(3e8)
-    msgs = nbp.delay_scan([hw.det], time_motor, [0, goal], 1, duration=0.01)
-    moves = list(msg.args[0] for msg in msgs if msg.command == 'set')
+    msgs, moves, _ = collect_plan(
+        nbp.delay_scan([hw.det], time_motor, [0, goal], 1, duration=0.01)
+    )
     # first point is the velo, which should be close to 1 with 1 bounce set
     assert np.isclose(moves[0], 1, rtol=1e-2)
     # next we move the time motor between zero and goal
@@ -82,24 +157,19 @@ def test_delay_scan(RE, hw, time_motor):
 
 
 @pytest.mark.timeout(PLAN_TIMEOUT)
-def test_daq_delay_scan(RE, daq, hw, time_motor):
+def test_daq_delay_scan(daq, hw, time_motor):
     """Check that daq_delay_scan's arguments all work."""
     logger.debug('test_daq_delay_scan')
 
     msgs = list(nbp.daq_delay_scan([hw.det], time_motor, [0, 1], 1,
                                    duration=0.01, record=True))
-    configure_message = None
-    for msg in msgs:
-        if msg.command == 'configure' and msg.obj is daq:
-            configure_message = msg
-            break
+    configure_message = next((msg for msg in msgs
+                              if msg.command == 'configure'
+                              and msg.obj is daq), None)
     assert configure_message is not None, 'Did not find daq configure message.'
     assert configure_message.kwargs['record'] is True
     assert configure_message.kwargs.get('controls') is None
 
-    # Run the scan
-    RE(msgs)
-
 
 def assert_scan_has_daq(msgs, daq):
     """
@@ -118,11 +188,9 @@ def assert_scan_has_daq(msgs, daq):
 
     logger.debug('assert_scan_has_daq')
 
-    message_types = defaultdict(int)
-
-    for msg in msgs:
-        if msg.obj is daq:
-            message_types[msg.command] = message_types[msg.command] + 1
+    message_types = Counter(command for obj, command
+                            in map(attrgetter('obj', 'command'), msgs)
+                            if obj is daq)
 
     assert 'stage' in message_types, 'Scan does not stage daq.'
     assert 'configure' in message_types, 'Scan does not configure daq.'
@@ -136,269 +204,218 @@ def assert_scan_has_daq(msgs, daq):
     assert message_types['unstage'] == 1, 'Scan unstages daq multiple times.'
 
 
+def record_plan(plan):
+    """
+    Keep the messages of a plan as it is run.
+
+    Returns the list that the messages are appended to and the wrapped plan.
+    """
+    msgs = []
+
+    def record(msg):
+        msgs.append(msg)
+        return msg
+
+    return msgs, msg_mutator(plan, record)
+
+
 def daq_test(RE, daq, plan):
-    """Check the messages for daq and try to run the plan with RE."""
+    """Run the plan with RE and check the messages for daq."""
     logger.debug('daq_test')
-    msgs = list(plan)
+    msgs, plan = record_plan(plan)
+    RE(plan)
     assert_scan_has_daq(msgs, daq)
-    RE(msgs)
     return msgs
 
 
 @pytest.mark.timeout(PLAN_TIMEOUT)
-def test_daq_count(RE, daq, hw):
+@pytest.mark.parametrize(
+    "plan_builder",
+    [
+        pytest.param(lambda hw: nbp.daq_count(events=1),
+                     id='no_dets'),
+        pytest.param(lambda hw: nbp.daq_count(num=5, events=1),
+                     id='num'),
+        pytest.param(lambda hw: nbp.daq_count([hw.det], num=5, events=1),
+                     id='dets'),
+    ],
+)
+def test_daq_count(RE, daq, hw, plan_builder):
     logger.debug('test_daq_count')
-    daq_test(RE, daq, nbp.daq_count(events=1))
-    daq_test(RE, daq, nbp.daq_count(num=5, events=1))
-    daq_test(RE, daq, nbp.daq_count([hw.det], num=5, events=1))
-
-
-@pytest.mark.timeout(PLAN_TIMEOUT)
-def test_daq_scan(RE, daq, hw):
-    logger.debug('test_daq_scan')
-    daq_test(RE, daq, nbp.daq_scan(hw.motor, 0, 10, 11, events=1))
-    daq_test(RE, daq, nbp.daq_scan([hw.det], hw.motor, 0, 10, 11, events=1))
-    daq_test(RE, daq, nbp.daq_scan([hw.det1, hw.det2],
-                                   hw.motor1, 0, 10,
-                                   hw.motor2, 0, 10, 11,
-                                   events=1))
+    daq_test(RE, daq, plan_builder(hw))
+
+
+# Smoke tests for the daq scans, each builds a plan from the ``hw`` fixture
+DAQ_PLAN_BUILDERS = {
+    'daq_scan-no_dets': lambda hw: nbp.daq_scan(hw.motor, 0, 10, 11, events=1),
+    'daq_scan': lambda hw: nbp.daq_scan([hw.det], hw.motor, 0, 10, 11,
+                                        events=1),
+    'daq_scan-2d': lambda hw: nbp.daq_scan([hw.det1, hw.det2],
+                                           hw.motor1, 0, 10,
+                                           hw.motor2, 0, 10, 11,
+                                           events=1),
+    'daq_list_scan-no_dets': lambda hw: nbp.daq_list_scan(hw.motor,
+                                                          list(range(10)),
+                                                          events=1),
+    'daq_list_scan': lambda hw: nbp.daq_list_scan([hw.det], hw.motor,
+                                                  list(range(10)),
+                                                  events=1),
+    'daq_list_scan-2d': lambda hw: nbp.daq_list_scan(
+        [hw.det1, hw.det2],
+        hw.motor1, list(range(10)),
+        hw.motor2, list(range(10)),
+        events=1),
+    'daq_ascan': lambda hw: nbp.daq_ascan([hw.det], hw.motor, 0, 10, 11,
+                                          events=1),
+    'daq_dscan': lambda hw: nbp.daq_dscan([hw.det], hw.motor, 0, 10, 11,
+                                          events=1),
+    'daq_a2scan': lambda hw: nbp.daq_a2scan([hw.det],
+                                            hw.motor1, 0, 10,
+                                            hw.motor2, 0, 10, 11,
+                                            events=1),
+    'daq_a3scan': lambda hw: nbp.daq_a3scan([hw.det],
+                                            hw.motor1, 0, 10,
+                                            hw.motor2, 0, 10,
+                                            hw.motor3, 0, 10, 11,
+                                            events=1),
+    'daq_d2scan': lambda hw: nbp.daq_d2scan([hw.det],
+                                            hw.motor1, 0, 10,
+                                            hw.motor2, 0, 10, 11,
+                                            events=1),
+    'daq_anscan-1d': lambda hw: nbp.daq_anscan([hw.det],
+                                               hw.motor1, 0, 10, 11,
+                                               events=1),
+    'daq_anscan-2d': lambda hw: nbp.daq_anscan([hw.det],
+                                               hw.motor1, 0, 10,
+                                               hw.motor2, 0, 10, 11,
+                                               events=1),
+    'daq_anscan-3d': lambda hw: nbp.daq_anscan([hw.det],
+                                               hw.motor1, 0, 10,
+                                               hw.motor2, 0, 10,
+                                               hw.motor3, 0, 10, 11,
+                                               events=1),
+    'daq_dnscan-1d': lambda hw: nbp.daq_dnscan([hw.det],
+                                               hw.motor1, 0, 10, 11,
+                                               events=1),
+    'daq_dnscan-2d': lambda hw: nbp.daq_dnscan([hw.det],
+                                               hw.motor1, 0, 10,
+                                               hw.motor2, 0, 10, 11,
+                                               events=1),
+    'daq_dnscan-3d': lambda hw: nbp.daq_dnscan([hw.det],
+                                               hw.motor1, 0, 10,
+                                               hw.motor2, 0, 10,
+                                               hw.motor3, 0, 10, 11,
+                                               events=1),
+}
 
 
 @pytest.mark.timeout(PLAN_TIMEOUT)
-def test_daq_list_scan(RE, daq, hw):
-    logger.debug('test_daq_list_scan')
-    daq_test(RE, daq, nbp.daq_list_scan(hw.motor, list(range(10)), events=1))
-    daq_test(RE, daq, nbp.daq_list_scan([hw.det], hw.motor, list(range(10)),
-                                        events=1))
-    daq_test(RE, daq, nbp.daq_list_scan([hw.det1, hw.det2],
-                                        hw.motor1, list(range(10)),
-                                        hw.motor2, list(range(10)),
-                                        events=1))
+@pytest.mark.parametrize(
+    "plan_builder",
+    [pytest.param(builder, id=plan_id)
+     for plan_id, builder in DAQ_PLAN_BUILDERS.items()],
+)
+def test_daq_plan(daq, hw, plan_builder):
+    logger.debug('test_daq_plan')
+    assert_scan_has_daq(list(plan_builder(hw)), daq)
 
 
 @pytest.mark.timeout(PLAN_TIMEOUT)
-def test_daq_ascan(RE, daq, hw):
-    logger.debug('test_daq_ascan')
-    daq_test(RE, daq, nbp.daq_ascan([hw.det], hw.motor, 0, 10, 11, events=1))
+def test_daq_plans_run(RE, daq, hw):
+    """Run all of the daq scan smoke tests in a single RE call."""
+    logger.debug('test_daq_plans_run')
+    RE(pchain(*(builder(hw) for builder in DAQ_PLAN_BUILDERS.values())))
 
 
 @pytest.mark.timeout(PLAN_TIMEOUT)
-def test_daq_dscan(RE, daq, hw):
+def test_daq_dscan(daq, hw):
     logger.debug('test_daq_dscan')
-    daq_test(RE, daq, nbp.daq_dscan([hw.det], hw.motor, 0, 10, 11, events=1))
-
     # Quick sanity check on the deltas
     hw.motor.set(42)
-    msgs = list(nbp.daq_dscan([hw.det], hw.motor, 0, 10, 11, events=1))
-    moves = [msg.args[0] for msg in msgs if msg.command == 'set']
+    _, moves, _ = collect_plan(
+        nbp.daq_dscan([hw.det], hw.motor, 0, 10, 11, events=1)
+    )
     assert moves == list(range(42, 42 + 11)) + [42]
 
 
 @pytest.mark.timeout(PLAN_TIMEOUT)
-def test_daq_a2scan(RE, daq, hw):
-    logger.debug('test_daq_a2scan')
-    daq_test(RE, daq, nbp.daq_a2scan([hw.det], hw.motor1, 0, 10, hw.motor2, 0,
-                                     10, 11, events=1))
-
-
-@pytest.mark.timeout(PLAN_TIMEOUT)
-def test_daq_a3scan(RE, daq, hw):
-    logger.debug('test_daq_a3scan')
-    daq_test(RE, daq, nbp.daq_a3scan([hw.det],
-                                     hw.motor1, 0, 10,
-                                     hw.motor2, 0, 10,
-                                     hw.motor3, 0, 10, 11,
-                                     events=1))
-
-
-@pytest.mark.timeout(PLAN_TIMEOUT)
-def test_daq_d2scan(RE, daq, hw):
-    logger.debug('test_daq_d2scan')
-    daq_test(RE, daq, nbp.daq_d2scan([hw.det],
-                                     hw.motor1, 0, 10,
-                                     hw.motor2, 0, 10, 11,
-                                     events=1))
-
-
-@pytest.mark.timeout(PLAN_TIMEOUT)
-def test_daq_anscan(RE, daq, hw):
-    logger.debug('test_daq_anscan')
-    daq_test(RE, daq, nbp.daq_anscan([hw.det],
-             hw.motor1, 0, 10, 11,
-             events=1))
-
-    daq_test(RE, daq, nbp.daq_anscan([hw.det],
-             hw.motor1, 0, 10,
-             hw.motor2, 0, 10, 11,
-             events=1))
+@pytest.mark.parametrize(
+    "plan_fn, daq_kwargs, expected_moves, n_reads",
+    [
+        pytest.param(nbp.fixed_target_scan, None,
+                     FT_EXPECTED_MOVES, None,
+                     id='fixed_target_scan'),
+        pytest.param(nbp.fixed_target_multi_scan, None,
+                     FT_MULTI_EXPECTED_MOVES, 24,
+                     id='fixed_target_multi_scan'),
+        pytest.param(nbp.daq_fixed_target_scan, dict(record=True, events=1),
+                     FT_EXPECTED_MOVES, None,
+                     id='daq_fixed_target_scan'),
+        pytest.param(nbp.daq_fixed_target_multi_scan,
+                     dict(record=True, events=1),
+                     FT_MULTI_EXPECTED_MOVES, 24,
+                     id='daq_fixed_target_multi_scan'),
+    ],
+)
+def test_fixed_target_scans(RE, daq, hw, sample_file, plan_fn, daq_kwargs,
+                            expected_moves, n_reads):
+    logger.debug('test_fixed_target_scans')
+    ss = [1, 2]
 
-    daq_test(RE, daq, nbp.daq_anscan([hw.det],
-             hw.motor1, 0, 10,
-             hw.motor2, 0, 10,
-             hw.motor3, 0, 10, 11,
-             events=1))
+    msgs, moves, by_command = collect_plan(
+        plan_fn(sample='test_sample', detectors=[hw.det],
+                x_motor=hw.motor1, y_motor=hw.motor2,
+                scan_motor=hw.motor3, ss=ss,
+                n_shots=3, path=sample_file, **(daq_kwargs or {}))
+    )
+    if daq_kwargs is not None:
+        configure_message = next((msg for msg in by_command['configure']
+                                  if msg.obj is daq), None)
+        assert configure_message is not None, ('Did not find daq configure '
+                                               'message.')
+        assert configure_message.kwargs['record'] is True
+        assert configure_message.kwargs['controls'] == [hw.motor1,
+                                                        hw.motor2,
+                                                        hw.motor3]
+
+    np.testing.assert_allclose(moves, expected_moves, rtol=0, atol=1e-12)
+    if n_reads is not None:
+        assert len(by_command['read']) == n_reads
+
+    # The daq variants wrap the same scans, only run the plain ones
+    if daq_kwargs is None:
+        RE(msgs)
 
 
 @pytest.mark.timeout(PLAN_TIMEOUT)
-def test_daq_dnscan(RE, daq, hw):
-    logger.debug('test_daq_dnscan')
-    daq_test(RE, daq, nbp.daq_dnscan([hw.det],
-             hw.motor1, 0, 10, 11,
-             events=1))
-
-    daq_test(RE, daq, nbp.daq_dnscan([hw.det],
-             hw.motor1, 0, 10,
-             hw.motor2, 0, 10, 11,
-             events=1))
-
-    daq_test(RE, daq, nbp.daq_dnscan([hw.det],
-             hw.motor1, 0, 10,
-             hw.motor2, 0, 10,
-             hw.motor3, 0, 10, 11,
-             events=1))
+def test_daq_wrapped_plans_run(RE, daq, hw, time_motor, sample_file):
+    """Run the daq plans that are otherwise only inspected in one RE call."""
+    logger.debug('test_daq_wrapped_plans_run')
+    ft_kwargs = dict(sample='test_sample', detectors=[hw.det],
+                     x_motor=hw.motor1, y_motor=hw.motor2,
+                     scan_motor=hw.motor3, ss=[1, 2], path=sample_file,
+                     record=True, events=1)
+    RE(pchain(
+        nbp.daq_delay_scan([hw.det], time_motor, [0, 1], 1, duration=0.01,
+                           record=True),
+        # Shoots 6 and then 2 of the 8 targets of the sample file
+        nbp.daq_fixed_target_scan(n_shots=3, **ft_kwargs),
+        nbp.daq_fixed_target_multi_scan(n_shots=3, **ft_kwargs),
+    ))
+    _, _, status = get_sample_targets_arrays('test_sample', sample_file)
+    assert status.all()
 
 
 @pytest.mark.timeout(PLAN_TIMEOUT)
-def test_fixed_target_scan(RE, hw, sample_file):
-    logger.debug('test_fixed_target_scan')
-    ss = [1, 2]
-
-    msgs = list(nbp.fixed_target_scan(sample='test_sample', detectors=[hw.det],
-                                      x_motor=hw.motor1, y_motor=hw.motor2,
-                                      scan_motor=hw.motor3, ss=ss,
-                                      n_shots=3, path=sample_file))
-    expected_moves = [1,                    # scan_motor[0]
-                      -20.59374999999996,   # x[0]
-                      26.41445312499999,    # y[0]
-                      -20.342057291666624,  # x[1]
-                      26.412369791666656,   # y[1]
-                      -20.090364583333283,  # x[2]
-                      26.41028645833332,    # y[2]
-                      2,                    # scan_motor[1]
-                      -19.838671874999946,  # x[3]
-                      26.408203124999986,   # y[3]
-                      -19.834546874999948,  # x[4]
-                      26.664453124999994,   # y[4]
-                      -20.08622265624995,   # x[5]
-                      26.66232812499999]    # y[5]
-
-    moves = [msg.args[0] for msg in msgs if msg.command == 'set']
-    assert moves == expected_moves
-
-    RE(msgs)
-    summarize_plan(m for m in msgs)
-
+def test_fixed_target_scan_out_of_targets(RE, hw, sample_file):
+    logger.debug('test_fixed_target_scan_out_of_targets')
     with pytest.raises(IndexError):
         RE(nbp.fixed_target_scan(sample='test_sample', detectors=[hw.det],
                                  x_motor=hw.motor1, y_motor=hw.motor2,
-                                 scan_motor=hw.motor3, ss=ss,
+                                 scan_motor=hw.motor3, ss=[1, 2],
                                  n_shots=10, path=sample_file))
 
 
-@pytest.mark.timeout(PLAN_TIMEOUT)
-def test_fixed_target_multi_scan(RE, hw, sample_file):
-    logger.debug('test_fixed_target_multi_scan')
-    ss = [1, 2]
-
-    msgs = list(nbp.fixed_target_multi_scan(sample='test_sample',
-                                            detectors=[hw.det],
-                                            x_motor=hw.motor1,
-                                            y_motor=hw.motor2,
-                                            scan_motor=hw.motor3, ss=ss,
-                                            n_shots=3, path=sample_file))
-    expected_moves = [1,                    # scan_motor[0]
-                      -20.59374999999996,   # x[0]
-                      26.41445312499999,    # y[0]
-                      -20.59374999999996,   # x[0]
-                      26.41445312499999,    # y[0]
-                      -20.59374999999996,   # x[0]
-                      26.41445312499999,    # y[0]
-                      2,                    # scan_motor[1]
-                      -20.342057291666624,  # x[1]
-                      26.412369791666656,
-                      -20.342057291666624,  # x[1]
-                      26.412369791666656,
-                      -20.342057291666624,  # x[1]
-                      26.412369791666656]   # y[1]
-
-    moves = [msg.args[0] for msg in msgs if msg.command == 'set']
-    reads = [msg for msg in msgs if msg.command == 'read']
-    assert moves == expected_moves
-    assert len(reads) == 24
-
-    RE(msgs)
-    summarize_plan(m for m in msgs)
-
-
-@pytest.mark.timeout(PLAN_TIMEOUT)
-def test_daq_fixed_target_scan(RE, daq, hw, sample_file):
-    logger.debug('test_daq_fixed_target_scan')
-    ss = [1, 2]
-
-    msgs = list(nbp.daq_fixed_target_scan(sample='test_sample',
-                                          detectors=[hw.det],
-                                          x_motor=hw.motor1, y_motor=hw.motor2,
-                                          scan_motor=hw.motor3, ss=ss,
-                                          n_shots=3, path=sample_file,
-                                          record=True, events=1))
-    configure_message = None
-    for msg in msgs:
-        if msg.command == 'configure' and msg.obj is daq:
-            configure_message = msg
-            break
-
-    assert configure_message.kwargs['record'] is True
-    assert configure_message.kwargs['controls'] == [hw.motor1, hw.motor2,
-                                                    hw.motor3]
-    RE(msgs)
-    summarize_plan(m for m in msgs)
-
-
-@pytest.mark.timeout(PLAN_TIMEOUT)
-def test_daq_fixed_target_multi_scan(RE, daq, hw, sample_file):
-    logger.debug('test_daq_fixed_target_scan')
-    ss = [1, 2]
-
-    msgs = list(nbp.daq_fixed_target_multi_scan(sample='test_sample',
-                                                detectors=[hw.det],
-                                                x_motor=hw.motor1,
-                                                y_motor=hw.motor2,
-                                                scan_motor=hw.motor3, ss=ss,
-                                                n_shots=3, path=sample_file,
-                                                record=True, events=1))
-    configure_message = None
-    for msg in msgs:
-        if msg.command == 'configure' and msg.obj is daq:
-            configure_message = msg
-            break
-
-    assert configure_message.kwargs['record'] is True
-    assert configure_message.kwargs['controls'] == [hw.motor1, hw.motor2,
-                                                    hw.motor3]
-
-    expected_moves = [1,                    # scan_motor[0]
-                      -20.59374999999996,   # x[0]
-                      26.41445312499999,    # y[0]
-                      -20.59374999999996,   # x[0]
-                      26.41445312499999,    # y[0]
-                      -20.59374999999996,   # x[0]
-                      26.41445312499999,    # y[0]
-                      2,                    # scan_motor[1]
-                      -20.342057291666624,  # x[1]
-                      26.412369791666656,
-                      -20.342057291666624,  # x[1]
-                      26.412369791666656,
-                      -20.342057291666624,  # x[1]
-                      26.412369791666656]   # y[1]
-
-    moves = [msg.args[0] for msg in msgs if msg.command == 'set']
-    reads = [msg for msg in msgs if msg.command == 'read']
-    assert moves == expected_moves
-    assert len(reads) == 24
-    RE(msgs)
-    summarize_plan(m for m in msgs)
-
-
 @pytest.mark.timeout(PLAN_TIMEOUT)
 @pytest.mark.parametrize(
     "start, stop, num, n_reads",
@@ -415,22 +432,23 @@ def test_daq_step_size(daq, hw, start, stop, num, n_reads):
     x_start = 1
     # absolute scan
     hw.motor1.set(x_start)
-    msgs = list(nbp.daq_ascan([hw.det], hw.motor1,
-                              start, stop, num, events=1))
-
-    a_moves = [msg.args[0] for msg in msgs if msg.command == 'set']
-    reads = [msg for msg in msgs if msg.command == 'read']
+    _, a_moves, by_command = collect_plan(
+        nbp.daq_ascan([hw.det], hw.motor1, start, stop, num, events=1)
+    )
 
     a_expected_moves = orange(start, stop, num)
 
-    assert len(reads) == n_reads
+    assert len(by_command['read']) == n_reads
     # move back to start after plan end
-    assert np.isclose(a_moves, a_expected_moves + [x_start]).all()
+    assert np.allclose(a_moves, np.fromiter(
+        chain(a_expected_moves, (x_start,)), dtype=np.float64,
+        count=len(a_expected_moves) + 1))
 
     # relative scan
     hw.motor1.set(x_start)
-    msgs = list(nbp.daq_dscan([hw.det], hw.motor1,
-                              start, stop, num, events=1))
+    _, d_moves, by_command = collect_plan(
+        nbp.daq_dscan([hw.det], hw.motor1, start, stop, num, events=1)
+    )
 
     # daq_dscan applies the relative shift after the steps are
     # computed, so we do here too.  This avoids some weird floating
@@ -438,11 +456,34 @@ def test_daq_step_size(daq, hw, start, stop, num, n_reads):
     d_expected_moves = orange(start, stop, num)
     d_expected_moves = [x+x_start for x in d_expected_moves]
 
-    d_moves = [msg.args[0] for msg in msgs if msg.command == 'set']
-    reads = [msg for msg in msgs if msg.command == 'read']
+    assert len(by_command['read']) == n_reads
+    assert np.allclose(d_moves, np.fromiter(
+        chain(d_expected_moves, (x_start,)), dtype=np.float64,
+        count=len(d_expected_moves) + 1))
 
-    assert len(reads) == n_reads
-    assert np.isclose(d_moves, d_expected_moves + [x_start]).all()
+
+@pytest.mark.timeout(PLAN_TIMEOUT)
+@pytest.mark.parametrize(
+    "start, stop, num, expected_moves",
+    [
+        (0, 10, 3.0, [0, 3, 6, 9]),  # stop is not on the step grid
+        (0, 1, 0.3, [0, 0.3, 0.6, 0.9]),
+        (0, 1, 0.4, [0, 0.4, 0.8]),
+        (10, 0, 3.0, [10, 7, 4, 1]),  # negative direction
+    ],
+)
+def test_daq_step_size_keeps_step(daq, hw, start, stop, num, expected_moves):
+    x_start = 1
+    hw.motor1.set(x_start)
+    _, moves, by_command = collect_plan(
+        nbp.daq_ascan([hw.det], hw.motor1, start, stop, num, events=1)
+    )
+
+    # expect 3 reads / point (det, motor, daq)
+    assert len(by_command['read']) == 3 * len(expected_moves)
+    # move back to start after plan end
+    np.testing.assert_allclose(moves, expected_moves + [x_start],
+                               rtol=0, atol=1e-12)
 
 
 @pytest.mark.timeout(PLAN_TIMEOUT)
@@ -10,8 +10,6 @@ from ophyd.sim import SynAxis, hw
 import nabs.plans as nbp
 from nabs.simulators import validate_plan
 
-hw = hw()
-
 
 class LimitedMotor(SynAxis):
     def check_value(self, value, **kwargs):
@@ -19,12 +17,18 @@ class LimitedMotor(SynAxis):
             raise ValueError("value out of bounds")
 
 
-limit_motor = LimitedMotor(name='limit_motor', labels={'motors'})
+@pytest.fixture(scope='module')
+def sim_hw():
+    # Everything from ophyd, shared by the tests in this module
+    sim_hw = hw()
+    # Add a motor that refuses to move out of its limits
+    sim_hw.limit_motor = LimitedMotor(name='limit_motor', labels={'motors'})
+    return sim_hw
 
 
 @bpp.set_run_key_decorator("run_2")
 @bpp.run_decorator(md={})
-def sim_plan_inner(npts=2):
+def sim_plan_inner(hw, npts=2):
     for j in range(npts):
         yield from bps.mov(hw.motor1, j * 0.1 + 1,
                            hw.motor2, j * 0.2 - 2)
@@ -34,39 +38,39 @@ def sim_plan_inner(npts=2):
 
 @bpp.set_run_key_decorator("run_1")
 @bpp.run_decorator(md={})
-def sim_plan_outer(npts):
+def sim_plan_outer(hw, npts):
     for j in range(int(npts/2)):
         yield from bps.mov(hw.motor, j * 0.2)
         yield from bps.trigger_and_read([hw.motor, hw.det])
 
-    yield from sim_plan_inner(npts + 1)
+    yield from sim_plan_inner(hw, npts + 1)
 
     for j in range(int(npts/2), npts):
         yield from bps.mov(hw.motor, j * 0.2)
         yield from bps.trigger_and_read([hw.motor, hw.det])
 
 
-def bad_limits():
+def bad_limits(hw):
     yield from bps.open_run()
     yield from bps.sleep(1)
-    yield from bps.mv(limit_motor, 100)
+    yield from bps.mv(hw.limit_motor, 100)
     yield from bps.sleep(1)
     yield from bps.close_run()
 
 
-def bad_nesting():
+def bad_nesting(hw):
     yield from bps.open_run()
     yield from bp.count([])
     yield from bps.close_run()
 
 
-def bad_call():
+def bad_call(hw):
     yield from bps.open_run()
-    limit_motor.set(10)
+    hw.limit_motor.set(10)
     yield from bps.close_run()
 
 
-def bad_stage():
+def bad_stage(hw):
     yield from bps.stage(hw.det)
 
 
@@ -78,22 +82,26 @@ def bad_stage():
         bad_call,
     ],
 )
-def test_bad_plans(RE, plan):
+def test_bad_plans(RE, sim_hw, plan):
     if sys.platform == "win32" and plan is bad_call:
         pytest.skip(reason="bad_call check does not work on windows")
-    success, _ = validate_plan(plan())
+    success, _ = validate_plan(plan(sim_hw))
     assert not success, "Plan was supposed to be bad"
 
 
 @pytest.mark.parametrize(
-    "plan",
+    "plan_builder",
     [
-        sim_plan_outer(4),
-        bp.count([hw.det], num=2),
-        bp.scan([hw.det, hw.det2, hw.motor], hw.motor, 0, 1, hw.motor2, 1, 20, 10),
-        nbp.daq_dscan([hw.det], hw.motor, 1, 0, 2, events=1),
+        pytest.param(lambda hw: sim_plan_outer(hw, 4), id='sim_plan_outer'),
+        pytest.param(lambda hw: bp.count([hw.det], num=2), id='count'),
+        pytest.param(lambda hw: bp.scan([hw.det, hw.det2, hw.motor],
+                                        hw.motor, 0, 1, hw.motor2, 1, 20, 10),
+                     id='scan'),
+        pytest.param(lambda hw: nbp.daq_dscan([hw.det], hw.motor, 1, 0, 2,
+                                              events=1),
+                     id='daq_dscan'),
     ],
 )
-def test_good_plans(RE, plan, daq):
-    success, msg = validate_plan(plan)
+def test_good_plans(RE, sim_hw, plan_builder, daq):
+    success, msg = validate_plan(plan_builder(sim_hw))
     assert success, msg
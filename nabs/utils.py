@@ -1,4 +1,5 @@
 import inspect
+import math
 import multiprocessing as mp
 import numbers
 import traceback
@@ -20,7 +21,7 @@ class InvertedSignal(DerivedSignal):
     def __init__(self, derived_from, *, name=None, **kwargs):
         # Create a name if None is given
         if not name:
-            name = derived_from.name + '_inverted'
+            name = f'{derived_from.name}_inverted'
         # Initialize the DerivedSignal
         super().__init__(derived_from, name=name, **kwargs)
 
@@ -50,7 +51,7 @@ class ErrorSignal(SignalRO, DerivedSignal):
     def __init__(self, derived_from, target, *, name=None, **kwargs):
         # Create a name if None is given
         if not name:
-            name = derived_from.name + '_error'
+            name = f'{derived_from.name}_error'
         # Store the target
         self.target = target
         # Initialize the DerivedSignal
@@ -94,18 +95,14 @@ def add_named_kwargs_to_signature(
     else:
         sig = inspect.signature(func_or_signature)
 
-    params = list(sig.parameters.values())
-    keyword_only_indices = [
-        idx for idx, param in enumerate(params)
-        if param.kind == inspect.Parameter.KEYWORD_ONLY
-    ]
-    if not keyword_only_indices:
-        start_params, end_params = params, []
-    else:
-        insert_at = keyword_only_indices[0]
-        start_params, end_params = params[:insert_at], params[insert_at:]
+    params = tuple(sig.parameters.values())
+    insert_at = next(
+        (idx for idx, param in enumerate(params)
+         if param.kind == inspect.Parameter.KEYWORD_ONLY),
+        len(params)
+    )
 
-    wrapper_params = list(
+    wrapper_params = tuple(
         inspect.Parameter(
             name, kind=inspect.Parameter.KEYWORD_ONLY, default=value
         )
@@ -113,7 +110,9 @@ def add_named_kwargs_to_signature(
         if name not in sig.parameters
     )
 
-    return sig.replace(parameters=start_params + wrapper_params + end_params)
+    return sig.replace(
+        parameters=params[:insert_at] + wrapper_params + params[insert_at:]
+    )
 
 
 class Process(mp.Process):
@@ -125,6 +124,8 @@ class Process(mp.Process):
         super().__init__(*args, **kwargs)
         self._pconn, self._cconn = mp.Pipe()
         self._exception = None
+        # The child sends exactly one result, stop polling once we have it
+        self._drained = False
 
     def run(self):
         try:
@@ -133,6 +134,8 @@ class Process(mp.Process):
         except Exception as e:
             tb = traceback.format_exc()
             self._cconn.send((e, tb))
+        finally:
+            self._cconn.close()
 
     def join_and_raise(self):
         super().join()
@@ -142,8 +145,9 @@ class Process(mp.Process):
 
     @property
     def exception(self):
-        if self._pconn.poll():
+        if not self._drained and self._pconn.poll():
             self._exception = self._pconn.recv()
+            self._drained = True
         return self._exception
 
 
@@ -153,7 +157,8 @@ def orange(start, stop, num, rtol=1.e-5, atol=1.e-7):
     integer, interpret as the number of points in a scan.  If `num`
     is a float, interpret it as a step size.
 
-    Modified to include end points.
+    Modified to include end points. With a step size, the end point is
+    included when it is a whole number of steps away from the start.
 
     Parameters
     ----------
@@ -167,6 +172,14 @@ def orange(start, stop, num, rtol=1.e-5, atol=1.e-7):
         if int, the number of points in the scan.
         if float, step size
 
+    rtol : float, optional
+        Only used if `num` is a step size. Relative tolerance on the number
+        of whole steps that fit between ``start`` and ``stop``, so that
+        ``stop`` is kept when rounding leaves it just short of a whole step.
+
+    atol : float, optional
+        Unused, kept for backwards compatibility.
+
     Returns
     -------
     list
@@ -174,9 +187,15 @@ def orange(start, stop, num, rtol=1.e-5, atol=1.e-7):
     """
     moves = []
     if isinstance(num, numbers.Integral):
-        moves = list(np.linspace(start, stop, num))
+        moves = np.linspace(start, stop, num).tolist()
     elif isinstance(num, numbers.Real):
-        num = np.sign(stop - start) * np.abs(num)
-        moves = list(np.arange(start, stop + num, num))
+        span = stop - start
+        step = math.copysign(abs(num), span)
+        # Only whole steps are taken, the scan ends on the last one that
+        # fits in the range and not necessarily on stop
+        ratio = abs(span) / abs(step)
+        n_steps = int(math.floor(ratio * (1 + rtol)))
+        points = np.linspace(start, start + step * n_steps, n_steps + 1)
+        moves = points.tolist()
 
     return moves
@@ -1,6 +1,6 @@
-import matplotlib.pyplot as plt
+import numpy as np
 
-from .plan_stubs import get_sample_targets
+from .plan_stubs import get_sample_targets_arrays
 
 
 def show_shot_targets(sample_name, path):
@@ -25,18 +25,21 @@ def show_shot_targets(sample_name, path):
         Indicates if the graph should be represented in terms of M and N
         points rather than x and y positions.
     """
+    # matplotlib is slow to import and only needed once we actually plot
+    import matplotlib.pyplot as plt
+
     plt.clf()
-    xx, yy = get_sample_targets(sample_name, path)
+    xx, yy, status = get_sample_targets_arrays(sample_name, path)
+    available = ~status
 
     # find the index of the next target to be shot
     # if can't find it, assume all targets were shot
-    x_index = next((index for (index, d) in enumerate(xx)
-                   if d['status'] is False), len(xx))
+    x_index = int(np.argmax(available)) if available.any() else len(xx)
 
-    xx_shot = [item['pos'] for item in xx if item['status'] is True]
-    yy_shot = [item['pos'] for item in yy if item['status'] is True]
-    xx_available = [item['pos'] for item in xx if item['status'] is False]
-    yy_available = [item['pos'] for item in yy if item['status'] is False]
+    xx_shot = xx[status]
+    yy_shot = yy[status]
+    xx_available = xx[available]
+    yy_available = yy[available]
     plt.plot(xx_available, yy_available, 'o', color='blue', markersize=1,
              label="available")
     plt.plot(xx_shot, yy_shot, 'o', color='orange', markersize=1, label="shot")